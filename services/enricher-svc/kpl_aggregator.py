@@ -0,0 +1,132 @@
+# KPL-compatible record aggregation for Kinesis producers
+#
+# Wire format (as produced by the Kinesis Producer Library and understood by the
+# KCL / aws-kinesis-agg deaggregators):
+#   4-byte magic | protobuf AggregatedRecord | 16-byte MD5 of the protobuf bytes
+import hashlib
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+KPL_MAGIC = b'\xf3\x89\x9a\xc2'
+DIGEST_SIZE = 16
+
+# One Kinesis PUT payload unit; aggregating up to it makes billing byte-based
+AGGREGATE_MAX_BYTES = 25 * 1024
+AGGREGATE_MAX_RECORDS = 500
+
+def _varint(value: int) -> bytes:
+    out = bytearray()
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+def _length_delimited(field_number: int, payload: bytes) -> bytes:
+    return _varint(field_number << 3 | 2) + _varint(len(payload)) + payload
+
+def _read_varint(buf: bytes, pos: int) -> Tuple[int, int]:
+    result = shift = 0
+    while True:
+        byte = buf[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result, pos
+        shift += 7
+
+def _encode_sub_record(data: bytes) -> bytes:
+    # Record { partition_key_index = 0; data = data }
+    # Every sub-record shares the aggregate's single partition key.
+    return _length_delimited(3, _varint(1 << 3) + _varint(0) + _length_delimited(3, data))
+
+def _finish(partition_key: str, sub_records: List[bytes]) -> Dict[str, Any]:
+    message = _length_delimited(1, partition_key.encode('utf-8')) + b''.join(sub_records)
+    return {
+        'Data': KPL_MAGIC + message + hashlib.md5(message).digest(),
+        'PartitionKey': partition_key
+    }
+
+def aggregate(
+    user_records: Iterable[Tuple[str, bytes]],
+    max_bytes: int = AGGREGATE_MAX_BYTES,
+    max_records: int = AGGREGATE_MAX_RECORDS
+) -> List[Dict[str, Any]]:
+    """Pack (partition_key, data) pairs into PutRecords entries, one partition key per aggregate.
+
+    Records keep their relative order within a partition key, so per-shard
+    ordering is preserved after deaggregation.
+    """
+    overhead = len(KPL_MAGIC) + DIGEST_SIZE
+    pending: Dict[str, Tuple[List[bytes], int]] = {}
+    aggregated = []
+
+    for partition_key, data in user_records:
+        encoded = _encode_sub_record(data)
+        sub_records, size = pending.get(partition_key, (None, 0))
+        if sub_records is not None and (
+            len(sub_records) >= max_records or size + len(encoded) > max_bytes
+        ):
+            aggregated.append(_finish(partition_key, sub_records))
+            sub_records = None
+        if sub_records is None:
+            sub_records = []
+            size = overhead + len(_length_delimited(1, partition_key.encode('utf-8')))
+        sub_records.append(encoded)
+        pending[partition_key] = (sub_records, size + len(encoded))
+
+    for partition_key, (sub_records, _) in pending.items():
+        aggregated.append(_finish(partition_key, sub_records))
+    return aggregated
+
+def deaggregate(data: bytes, partition_key: Optional[str] = None) -> List[Tuple[Optional[str], bytes]]:
+    """Split a Kinesis record into (partition_key, data) user records.
+
+    Records without the KPL magic header, or whose digest does not match, are
+    returned unchanged as a single user record.
+    """
+    if not data.startswith(KPL_MAGIC) or len(data) < len(KPL_MAGIC) + DIGEST_SIZE:
+        return [(partition_key, data)]
+
+    message = data[len(KPL_MAGIC):-DIGEST_SIZE]
+    if hashlib.md5(message).digest() != data[-DIGEST_SIZE:]:
+        return [(partition_key, data)]
+
+    partition_keys: List[str] = []
+    records: List[Tuple[int, bytes]] = []
+    pos = 0
+    while pos < len(message):
+        tag, pos = _read_varint(message, pos)
+        field_number, wire_type = tag >> 3, tag & 0x7
+        if wire_type == 0:
+            _, pos = _read_varint(message, pos)
+            continue
+        if wire_type != 2:
+            raise ValueError(f"Unsupported protobuf wire type {wire_type} in aggregated record")
+        length, pos = _read_varint(message, pos)
+        payload = message[pos:pos + length]
+        pos += length
+        if field_number == 1:
+            partition_keys.append(payload.decode('utf-8'))
+        elif field_number == 3:
+            records.append(_decode_sub_record(payload))
+
+    return [(partition_keys[index], sub_data) for index, sub_data in records]
+
+def _decode_sub_record(payload: bytes) -> Tuple[int, bytes]:
+    partition_key_index, data = 0, b''
+    pos = 0
+    while pos < len(payload):
+        tag, pos = _read_varint(payload, pos)
+        field_number, wire_type = tag >> 3, tag & 0x7
+        if wire_type == 0:
+            value, pos = _read_varint(payload, pos)
+            if field_number == 1:
+                partition_key_index = value
+        elif wire_type == 2:
+            length, pos = _read_varint(payload, pos)
+            if field_number == 3:
+                data = payload[pos:pos + length]
+            pos += length
+        else:
+            raise ValueError(f"Unsupported protobuf wire type {wire_type} in sub-record")
+    return partition_key_index, data
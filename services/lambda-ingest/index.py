@@ -4,12 +4,54 @@ import os
 import time
 import uuid
 import boto3
+from botocore.config import Config
 from datetime import datetime, timezone
 
+try:
+    import orjson
+    
+    # NumPy scalars from the scoring path serialize without conversion
+    _ORJSON_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_SERIALIZE_NUMPY
+    
+    def _dumps(obj):
+        return orjson.dumps(obj, option=_ORJSON_OPTIONS)
+    
+    _loads = orjson.loads
+except ImportError:  # orjson not packaged; fall back to stdlib json
+    def _dumps(obj):
+        return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+    
+    _loads = json.loads
+
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-kinesis_client = boto3.client('kinesis')
+# Resolved once per container; TCP keep-alive keeps the TLS session warm between invocations
+STREAM_NAME = os.environ.get('KINESIS_STREAM_NAME')
+kinesis_client = boto3.client('kinesis', config=Config(
+    tcp_keepalive=True,
+    max_pool_connections=10,
+    retries={'max_attempts': 3, 'mode': 'adaptive'}
+))
+
+# PutRecords limits per call
+MAX_BATCH_RECORDS = 500
+MAX_BATCH_BYTES = 5 * 1024 * 1024
+
+# Per-record limits; one record over them makes Kinesis reject the whole PutRecords call
+MAX_RECORD_BYTES = 1024 * 1024
+MAX_PARTITION_KEY_LENGTH = 256
+
+# Failed entries are retried with exponential backoff
+MAX_PUT_ATTEMPTS = 3
+RETRY_BASE_DELAY = 0.1
+
+# Response headers shared by every invocation; never mutated
+_JSON_HEADERS = {
+    'Content-Type': 'application/json',
+    'Access-Control-Allow-Origin': '*'
+}
+_ERROR_HEADERS = {'Content-Type': 'application/json'}
 
 def validate_event_schema(event_data):
     """Basic event validation"""
@@ -21,7 +63,7 @@ def validate_event_schema(event_data):
     
     return True, None
 
-def normalize_event(raw_event, source_ip):
+def normalize_event(raw_event, source_ip, received_at):
     """Normalize event to standard format"""
     event_id = raw_event.get('event_id', str(uuid.uuid4()))
     
@@ -32,7 +74,7 @@ def normalize_event(raw_event, source_ip):
     normalized = {
         'event_id': event_id,
         'source': raw_event.get('source'),
-        'received_at': datetime.now(timezone.utc).isoformat(),
+        'received_at': received_at,
         'actor': actor,
         'action': raw_event.get('action'),
         'resource': raw_event.get('resource'),
@@ -43,55 +85,116 @@ def normalize_event(raw_event, source_ip):
     
     return normalized
 
-def send_to_kinesis(event):
-    """Send event to Kinesis stream"""
-    try:
-        stream_name = os.environ.get('KINESIS_STREAM_NAME')
-        if not stream_name:
-            raise ValueError("KINESIS_STREAM_NAME environment variable not set")
-        
-        partition_key = f"{event.get('actor', {}).get('id', 'unknown')}#{event.get('source', 'unknown')}"
+# Shared read-only default so a missing actor doesn't allocate a dict per record
+_EMPTY_DICT = {}
+
+def _partition_key(event):
+    """Route by actor + source so one actor's events stay ordered on a shard"""
+    get = event.get
+    actor_id = get('actor', _EMPTY_DICT).get('id', 'unknown')
+    return f"{actor_id}#{get('source', 'unknown')}"
+
+def _record_size(record):
+    """Bytes a record counts against the PutRecords size limits"""
+    return len(record['Data']) + len(record['PartitionKey'].encode('utf-8'))
+
+def encode_record(normalized_event):
+    """Encode a normalized event as a PutRecords entry; returns (record, error)"""
+    record = {'Data': _dumps(normalized_event), 'PartitionKey': _partition_key(normalized_event)}
+    if len(record['PartitionKey']) > MAX_PARTITION_KEY_LENGTH:
+        return None, f"Partition key exceeds {MAX_PARTITION_KEY_LENGTH} characters"
+    if _record_size(record) > MAX_RECORD_BYTES:
+        return None, "Event exceeds the 1 MiB Kinesis record limit"
+    return record, None
+
+def _chunk_bounds(records):
+    """Yield (start, end) slices that respect the PutRecords count and size limits"""
+    start = 0
+    while start < len(records):
+        end, batch_bytes = start, 0
+        while end < len(records) and end - start < MAX_BATCH_RECORDS:
+            size = _record_size(records[end])
+            if end > start and batch_bytes + size > MAX_BATCH_BYTES:
+                break
+            batch_bytes += size
+            end += 1
+        yield start, end
+        start = end
+
+def _put_records_with_retry(stream_name, records, indices, results):
+    """PutRecords for the given indices, retrying throttled/failed entries with backoff"""
+    pending = list(indices)
+    for attempt in range(MAX_PUT_ATTEMPTS):
+        if attempt:
+            time.sleep(RETRY_BASE_DELAY * 2 ** (attempt - 1))
         
-        response = kinesis_client.put_record(
-            StreamName=stream_name,
-            Data=json.dumps(event),
-            PartitionKey=partition_key
-        )
+        try:
+            response = kinesis_client.put_records(
+                StreamName=stream_name,
+                Records=[records[i] for i in pending]
+            )
+        except Exception as e:
+            # Whole-call failures are retried by botocore's adaptive mode; the
+            # loop only retries entries Kinesis rejects individually
+            logger.error(f"Error sending batch of {len(pending)} to Kinesis: {str(e)}")
+            return
         
-        logger.info(f"Event sent to Kinesis: {event.get('event_id')}")
-        return True
+        failed = []
+        for i, result in zip(pending, response['Records']):
+            if 'ErrorCode' in result:
+                failed.append(i)
+            else:
+                results[i] = True
         
-    except Exception as e:
-        logger.error(f"Error sending to Kinesis: {str(e)}")
-        return False
+        if not failed:
+            return
+        logger.warning(f"Kinesis rejected {len(failed)}/{len(pending)} records (attempt {attempt + 1})")
+        pending = failed
+
+def send_batch_to_kinesis(records):
+    """Send encoded records to Kinesis stream with PutRecords; returns a success flag per record"""
+    if not records:
+        return []
+    
+    if not STREAM_NAME:
+        logger.error("KINESIS_STREAM_NAME environment variable not set")
+        return [False] * len(records)
+    
+    results = [False] * len(records)
+    for start, end in _chunk_bounds(records):
+        _put_records_with_retry(STREAM_NAME, records, range(start, end), results)
+    
+    logger.info(f"Sent {sum(results)}/{len(records)} events to Kinesis")
+    return results
 
 def lambda_handler(event, context):
     """Main Lambda handler"""
-    logger.info(f"Received event: {json.dumps(event, default=str)}")
+    # Serializing the whole API Gateway event is costly; only do it when debugging
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Received event: %s", json.dumps(event, default=str))
     
     try:
+        # One timestamp per invocation, shared by every event in a batch
+        now_iso = datetime.now(timezone.utc).isoformat()
         http_method = event.get('httpMethod', 'GET')
         
         if http_method == 'GET':
             return {
                 'statusCode': 200,
-                'headers': {
-                    'Content-Type': 'application/json',
-                    'Access-Control-Allow-Origin': '*'
-                },
-                'body': json.dumps({
+                'headers': _JSON_HEADERS,
+                'body': _dumps({
                     'status': 'healthy',
                     'service': 'secureops360-ingest',
-                    'timestamp': datetime.now(timezone.utc).isoformat(),
+                    'timestamp': now_iso,
                     'version': '1.0.0'
-                })
+                }).decode('utf-8')
             }
         
         if http_method != 'POST':
             return {
                 'statusCode': 405,
-                'headers': {'Content-Type': 'application/json'},
-                'body': json.dumps({'error': 'Method not allowed'})
+                'headers': _ERROR_HEADERS,
+                'body': _dumps({'error': 'Method not allowed'}).decode('utf-8')
             }
         
         # Get source IP
@@ -101,12 +204,12 @@ def lambda_handler(event, context):
         body = event.get('body', '{}')
         if isinstance(body, str):
             try:
-                body = json.loads(body)
-            except json.JSONDecodeError:
+                body = _loads(body)
+            except ValueError:
                 return {
                     'statusCode': 400,
-                    'headers': {'Content-Type': 'application/json'},
-                    'body': json.dumps({'error': 'Invalid JSON format'})
+                    'headers': _ERROR_HEADERS,
+                    'body': _dumps({'error': 'Invalid JSON format'}).decode('utf-8')
                 }
         
         # Handle single event or batch
@@ -114,6 +217,8 @@ def lambda_handler(event, context):
         
         processed_events = []
         errors = []
+        pending = []  # (index, event_id) for each record awaiting the Kinesis batch
+        records = []
         
         for i, raw_event in enumerate(events_to_process):
             try:
@@ -126,21 +231,20 @@ def lambda_handler(event, context):
                     })
                     continue
                 
-                normalized_event = normalize_event(raw_event, source_ip)
+                normalized_event = normalize_event(raw_event, source_ip, now_iso)
                 
-                success = send_to_kinesis(normalized_event)
-                
-                if success:
-                    processed_events.append({
-                        'event_id': normalized_event['event_id'],
-                        'status': 'accepted'
-                    })
-                else:
+                # Encode here so one unencodable or oversized event only fails its own index
+                record, error_msg = encode_record(normalized_event)
+                if record is None:
                     errors.append({
                         'index': i,
-                        'error': 'Failed to send to stream',
+                        'error': error_msg,
                         'event_id': normalized_event['event_id']
                     })
+                    continue
+                
+                pending.append((i, normalized_event['event_id']))
+                records.append(record)
                     
             except Exception as e:
                 errors.append({
@@ -149,6 +253,21 @@ def lambda_handler(event, context):
                     'event_id': raw_event.get('event_id', 'unknown')
                 })
         
+        results = send_batch_to_kinesis(records)
+        for (i, event_id), success in zip(pending, results):
+            if success:
+                processed_events.append({
+                    'event_id': event_id,
+                    'status': 'accepted'
+                })
+            else:
+                errors.append({
+                    'index': i,
+                    'error': 'Failed to send to stream',
+                    'event_id': event_id
+                })
+        errors.sort(key=lambda error: error['index'])
+        
         response_body = {
             'processed': len(processed_events),
             'errors': len(errors),
@@ -162,17 +281,14 @@ def lambda_handler(event, context):
         
         return {
             'statusCode': status_code,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*'
-            },
-            'body': json.dumps(response_body)
+            'headers': _JSON_HEADERS,
+            'body': _dumps(response_body).decode('utf-8')
         }
         
     except Exception as e:
         logger.error(f"Unhandled error: {str(e)}")
         return {
             'statusCode': 500,
-            'headers': {'Content-Type': 'application/json'},
-            'body': json.dumps({'error': 'Internal server error'})
+            'headers': _ERROR_HEADERS,
+            'body': _dumps({'error': 'Internal server error'}).decode('utf-8')
         }